@@ -1,15 +1,29 @@
 """
 Multi-Agent Data Analysis System
+
+Agents are imported lazily (PEP 562), so a caller that uses one agent or
+only a helper such as agents._cache doesn't pull in matplotlib, E2B and the
+Anthropic SDK for all the others. main.py still imports every agent up front.
 """
-from .statistical import run_statistical_analysis
-from .visualization import create_visualizations, create_visualization_html
-from .anomaly import run_anomaly_detection
-from .coordinator import synthesize_insights
-
-__all__ = [
-    'run_statistical_analysis',
-    'create_visualizations',
-    'create_visualization_html',
-    'run_anomaly_detection',
-    'synthesize_insights'
-]
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    'run_statistical_analysis': '.statistical',
+    'create_visualizations': '.visualization',
+    'create_visualization_html': '.visualization',
+    'run_anomaly_detection': '.anomaly',
+    'synthesize_insights': '.coordinator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
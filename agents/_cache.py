@@ -0,0 +1,229 @@
+"""
+Result Cache
+Content-addressed on-disk cache so reruns on an unchanged CSV skip agent work
+"""
+import hashlib
+import json
+import os
+import shutil
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "datalytics")
+
+# Bump whenever agent prompts or chart code change so stale entries are ignored
+CACHE_VERSION = "5"
+
+# Near-duplicate lookup: rows read per fingerprint, how many fingerprints are
+# remembered (oldest evicted first) and the largest allowed mean relative
+# difference in any one column's statistics
+FINGERPRINT_ROWS = 100_000
+FINGERPRINT_SLOTS = 16
+SIMILARITY_THRESHOLD = 0.01
+_FINGERPRINT_KEY = f"fingerprints-v{CACHE_VERSION}"
+
+
+def file_digest(path: str) -> str:
+    """Return the BLAKE2b hex digest of a file's contents"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def schema_digest(path: str) -> str:
+    """
+    Return a BLAKE2b digest of a CSV's column names and inferred dtypes
+
+    Generated analysis code depends only on the schema, so datasets that share
+    one can reuse it. Only a 100-row sample is read, so this stays cheap.
+    """
+    import pandas as pd
+
+    sample = pd.read_csv(path, nrows=100)
+    schema = ",".join(sample.columns) + "|" + ",".join(map(str, sample.dtypes))
+    return hashlib.blake2b(schema.encode(), digest_size=16).hexdigest()
+
+
+def value_digest(value) -> str:
+    """Return a BLAKE2b digest of a JSON-serializable value, independent of key order"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def cache_key(csv_digest: str, agent_name: str, version: str = CACHE_VERSION) -> str:
+    """Build the cache key for one agent's output on one dataset"""
+    return f"{csv_digest}-{agent_name}-v{version}"
+
+
+def _entry_path(key: str, suffix: str = ".json") -> str:
+    return os.path.join(CACHE_DIR, key + suffix)
+
+
+def load_cached(key: str):
+    """
+    Load a cached JSON value
+
+    Returns:
+        The cached value, or None on a cache miss
+    """
+    try:
+        with open(_entry_path(key), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def evict_cached(key: str) -> None:
+    """Delete a cached JSON value, if present"""
+    try:
+        os.remove(_entry_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def write_atomic(path: str, chunks, buffering: int = -1) -> None:
+    """
+    Write byte chunks to a temporary file, then move it over path
+
+    Readers never see a partial file. If producing or writing a chunk
+    fails, the temporary file is removed and the error re-raised.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb", buffering=buffering) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def store_cached(key: str, value) -> None:
+    """Atomically write a JSON value to the cache"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_atomic(_entry_path(key), [json.dumps(value, default=str).encode("utf-8")])
+
+
+def try_store(store, *args) -> bool:
+    """
+    Run a cache store such as store_cached, logging and swallowing OSError
+
+    The cache only saves work, so failing to write it (a full disk, an
+    unwritable cache directory) must never throw away finished results.
+
+    Returns:
+        True if the entry was written
+    """
+    try:
+        store(*args)
+        return True
+    except OSError as e:
+        print(f"   ⚠ Cache write failed: {e}")
+        return False
+
+
+def store_files(key: str, paths: list) -> None:
+    """Copy files into the cache and record their names under key"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    names = [os.path.basename(p) for p in paths]
+    for path, name in zip(paths, names):
+        shutil.copyfile(path, _entry_path(f"{key}-{name}", ""))
+    store_cached(key, names)
+
+
+def restore_files(key: str, output_dir: str):
+    """
+    Copy files cached under key into output_dir
+
+    Returns:
+        List of restored file paths, or None on a cache miss
+    """
+    names = load_cached(key)
+    if not names:
+        return None
+
+    sources = [_entry_path(f"{key}-{name}", "") for name in names]
+    if not all(os.path.exists(src) for src in sources):
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    restored = []
+    for src, name in zip(sources, names):
+        dest = os.path.join(output_dir, name)
+        shutil.copyfile(src, dest)
+        restored.append(dest)
+    return restored
+
+
+def data_fingerprint(path: str) -> dict:
+    """
+    Summarize a CSV as its schema plus per-column statistics
+
+    Reads at most FINGERPRINT_ROWS rows. Numeric columns contribute their
+    null count and describe() values; other columns their null count,
+    distinct count and top-value frequency, with the top values themselves
+    kept aside for an exact match. The file size and row count lead the
+    vector, so edits past the row cap still register.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path, nrows=FINGERPRINT_ROWS)
+    schema = ",".join(df.columns) + "|" + ",".join(map(str, df.dtypes))
+    nulls = df.isna().sum()
+    numeric = df.select_dtypes(include="number")
+    other = df.select_dtypes(exclude="number")
+    numeric_stats = numeric.describe() if not numeric.empty else None
+    other_stats = other.describe() if not other.empty else None
+
+    columns = [[os.path.getsize(path), len(df)]]
+    top_values = []
+    for name in df.columns:
+        if name in numeric.columns:
+            stats = numeric_stats[name].tolist()
+        else:
+            stats = [other_stats.at["unique", name], other_stats.at["freq", name]]
+            top_values.append(str(other_stats.at["top", name]))
+        columns.append([nulls[name], *stats])
+
+    return {
+        "schema": value_digest(schema),
+        "top_values": value_digest(top_values),
+        "columns": [[0.0 if pd.isna(v) else float(v) for v in stats] for stats in columns],
+    }
+
+
+def _relative_distance(a: list, b: list) -> float:
+    """Mean per-statistic relative difference, so no one statistic's scale dominates"""
+    diffs = [abs(x - y) / max(abs(x), abs(y)) for x, y in zip(a, b) if x != y]
+    return sum(diffs) / len(a)
+
+
+def find_similar(fingerprint: dict):
+    """
+    Find a remembered dataset that differs by under SIMILARITY_THRESHOLD
+
+    Candidates must share the schema and every non-numeric column's top
+    value. Distance is the worst column's mean relative difference, so a
+    change confined to one column of a wide table still counts in full.
+
+    Returns:
+        The closest matching dataset's digest, or None if there is none
+    """
+    best, best_distance = None, SIMILARITY_THRESHOLD
+    for entry in load_cached(_FINGERPRINT_KEY) or []:
+        if (entry["schema"], entry.get("top_values")) != (fingerprint["schema"],
+                                                          fingerprint["top_values"]):
+            continue
+        distance = max(map(_relative_distance, fingerprint["columns"], entry["columns"]))
+        if distance < best_distance:
+            best, best_distance = entry["digest"], distance
+    return best
+
+
+def remember_fingerprint(csv_digest: str, fingerprint: dict) -> None:
+    """Record a dataset's fingerprint, evicting the oldest beyond FINGERPRINT_SLOTS"""
+    index = [entry for entry in load_cached(_FINGERPRINT_KEY) or []
+             if entry["digest"] != csv_digest]
+    index.append({"digest": csv_digest, **fingerprint})
+    store_cached(_FINGERPRINT_KEY, index[-FINGERPRINT_SLOTS:])
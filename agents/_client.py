@@ -0,0 +1,46 @@
+"""
+Shared Anthropic Client
+Lazily creates one AsyncAnthropic client so all agents reuse its connection pool
+"""
+from anthropic import AsyncAnthropic
+import asyncio
+import os
+
+_client = None
+
+# Well under the SDK's 10 minute default, but with room for long synthesis replies
+_TIMEOUT = 120.0
+
+# Cap on in-flight Claude requests across all concurrently running agents
+_request_slots = asyncio.Semaphore(int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8")))
+
+
+def get_client() -> AsyncAnthropic:
+    """
+    Return the process-wide AsyncAnthropic client, creating it on first use
+
+    Returns:
+        Shared AsyncAnthropic client
+    """
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=2,
+                                 timeout=_TIMEOUT)
+    return _client
+
+
+async def create_message(**kwargs):
+    """
+    Send a Messages API request through the shared client
+
+    Waits for a free request slot first, so fanning out many agents can't
+    exceed ANTHROPIC_MAX_CONCURRENCY simultaneous requests.
+
+    Args:
+        **kwargs: Arguments for client.messages.create
+
+    Returns:
+        The Message response
+    """
+    async with _request_slots:
+        return await get_client().messages.create(**kwargs)
@@ -0,0 +1,117 @@
+"""
+Shared Sandbox Lifecycle
+Creates one E2B sandbox per pipeline run and uploads the dataset to it once
+"""
+from e2b_code_interpreter import Sandbox
+import asyncio
+import os
+
+# Fixed upload location, so agents can be prompted before the sandbox exists
+DATASET_PATH = "/home/user/data.csv"
+
+# Imported once when a sandbox is created, while Claude is still writing the
+# agents' code; they stay in sys.modules across namespace resets, so agent
+# code imports them for free
+_WARMUP_CODE = "import json\nimport numpy\nimport pandas"
+
+# Prepended to agent code so each agent sharing the sandbox starts from a
+# clean namespace without a separate reset RPC
+_RESET_PREFIX = "%reset -f\n"
+
+# Cap on concurrent Sandbox.create calls, so fanning out many pipelines
+# doesn't stampede the E2B quota
+_create_slots = asyncio.Semaphore(int(os.getenv("SANDBOX_MAX_CONCURRENCY", "4")))
+
+# Closes running in the background; referenced here so they aren't GC'd
+_pending_closes: set = set()
+
+
+def _in_background(coro) -> None:
+    """Run a teardown coroutine as a task that shutdown_sandboxes will wait for"""
+    task = asyncio.create_task(coro)
+    _pending_closes.add(task)
+    task.add_done_callback(_pending_closes.discard)
+
+
+async def _create() -> Sandbox:
+    """Create a sandbox and pre-import the common analysis libraries"""
+    async with _create_slots:
+        sandbox = await asyncio.to_thread(Sandbox.create)
+    print("   ✓ E2B sandbox created")
+    await asyncio.to_thread(sandbox.run_code, _WARMUP_CODE)
+    return sandbox
+
+
+def _upload(sandbox: Sandbox, csv_path: str) -> None:
+    """Stream a local CSV to DATASET_PATH in the sandbox"""
+    # Hand the SDK the binary file object so httpx streams it in chunks
+    # rather than buffering the whole CSV in memory
+    with open(csv_path, "rb", buffering=1024 * 1024) as f:
+        sandbox.files.write(DATASET_PATH, f)
+
+
+async def open_sandbox(csv_path: str) -> Sandbox:
+    """
+    Create an E2B sandbox and upload the dataset to DATASET_PATH
+
+    Args:
+        csv_path: Path to local CSV file to upload
+
+    Returns:
+        Sandbox with the dataset uploaded
+    """
+    sandbox = await _create()
+    await asyncio.to_thread(_upload, sandbox, csv_path)
+    print(f"   ✓ Dataset uploaded to {DATASET_PATH}")
+
+    return sandbox
+
+
+async def run_code(sandbox: Sandbox, code: str):
+    """
+    Execute code in the sandbox in a fresh namespace, in a single RPC
+
+    Returns:
+        The E2B execution result
+    """
+    return await asyncio.to_thread(sandbox.run_code, _RESET_PREFIX + code)
+
+
+async def close_sandbox(sandbox) -> None:
+    """
+    Kill a sandbox created by open_sandbox
+
+    Never raises, so it is safe to call from a finally block.
+
+    Args:
+        sandbox: Sandbox to kill, or the task running open_sandbox
+    """
+    try:
+        if isinstance(sandbox, asyncio.Future):
+            sandbox = await sandbox
+    except Exception:
+        # Creation failed, so there is nothing to close
+        return
+
+    try:
+        await asyncio.to_thread(sandbox.kill)
+        print("   ✓ Sandbox closed")
+    except Exception as e:
+        print(f"   ⚠ Failed to close sandbox: {e}")
+
+
+def close_sandbox_in_background(sandbox) -> None:
+    """
+    Schedule close_sandbox without waiting for it
+
+    Lets a caller release a sandbox that is still being created without
+    blocking on the cold start or the teardown RPC; shutdown_sandboxes
+    waits for it.
+    """
+    _in_background(close_sandbox(sandbox))
+
+
+async def shutdown_sandboxes() -> None:
+    """Wait for every background sandbox close to finish"""
+    if _pending_closes:
+        await asyncio.gather(*_pending_closes)
@@ -0,0 +1,275 @@
+"""
+Sandbox Agent Loop
+Shared Claude + E2B flow used by the statistical and anomaly agents
+"""
+import asyncio
+import hashlib
+import json
+import string
+
+from ._cache import cache_key, evict_cached, load_cached, store_cached, try_store
+from ._client import create_message
+from ._sandbox import run_code
+
+MODEL = "claude-haiku-4-5-20251001"
+
+# Markers agents are told to print around their JSON results
+JSON_BEGIN = "<<<BEGIN_JSON>>>"
+JSON_END = "<<<END_JSON>>>"
+
+# Output budget for generated analysis code, which runs well under this
+CODE_MAX_TOKENS = 2000
+
+# Cap on the serialized results sent back to Claude for interpretation
+MAX_TOOL_RESULT_CHARS = 4000
+
+# Tool for code execution
+_TOOLS = [{
+    "name": "execute_python",
+    "description": "Execute Python code in the E2B sandbox",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "code": {
+                "type": "string",
+                "description": "Python code to execute"
+            }
+        },
+        "required": ["code"]
+    }
+}]
+
+
+def extract_json(stdout: list):
+    """
+    Parse the JSON object printed between JSON_BEGIN and JSON_END
+
+    Scans the sandbox stdout chunks in order and stops at the end marker,
+    so the rest of the output is never joined or searched.
+
+    Args:
+        stdout: List of stdout chunks from a sandbox execution
+
+    Returns:
+        Parsed JSON object, or None if the markers or a valid object are missing
+    """
+    parts = []
+    inside = False
+    for chunk in stdout:
+        if not inside:
+            start = chunk.find(JSON_BEGIN)
+            if start < 0:
+                continue
+            chunk = chunk[start + len(JSON_BEGIN):]
+            inside = True
+
+        end = chunk.find(JSON_END)
+        if end >= 0:
+            parts.append(chunk[:end])
+            try:
+                result = json.loads("".join(parts))
+            except json.JSONDecodeError:
+                return None
+            return result if isinstance(result, dict) else None
+        parts.append(chunk)
+
+    return None
+
+
+async def _run_fallback(sandbox, dataset_path: str, fallback_code: string.Template,
+                        defaults: dict) -> dict:
+    """
+    Run an agent's hand-written analysis code without another Claude call
+
+    Returns:
+        Parsed JSON results, or an error result
+    """
+    if isinstance(sandbox, asyncio.Future):
+        sandbox = await sandbox
+
+    code = fallback_code.substitute(path=repr(dataset_path))
+    execution = await run_code(sandbox, code)
+    results = None if execution.error else extract_json(execution.logs.stdout)
+
+    if results is None:
+        error = execution.error or "Fallback analysis printed no results"
+        print(f"   ✗ Fallback failed: {error}")
+        return {
+            "error": str(error),
+            "traceback": getattr(execution.error, 'traceback', None),
+            **defaults
+        }
+
+    print("   ✓ Fallback analysis executed successfully")
+    results["fallback"] = True
+    return results
+
+
+async def _request_code(system: list, messages: list):
+    """
+    Ask Claude for analysis code and append its reply to messages
+
+    The tool call is forced so Claude skips any preamble and replies with
+    code only.
+
+    Returns:
+        The execute_python tool_use block, or None if the reply has none
+        (e.g. it was truncated)
+    """
+    response = await create_message(
+        model=MODEL,
+        max_tokens=CODE_MAX_TOKENS,
+        system=system,
+        messages=messages,
+        tools=_TOOLS,
+        tool_choice={"type": "tool", "name": "execute_python"}
+    )
+    messages.append({"role": "assistant", "content": response.content})
+
+    blocks = {block.type: block for block in response.content}
+    return blocks.get("tool_use") if response.stop_reason == "tool_use" else None
+
+
+async def run_sandbox_agent(sandbox, dataset_path: str, instructions: str,
+                            code_label: str, defaults: dict,
+                            fallback_code: string.Template = None,
+                            schema: str = None) -> dict:
+    """
+    Have Claude write analysis code, run it in the sandbox, then interpret it
+
+    The sandbox may still be starting up: the first Claude call only needs
+    the dataset path, so it overlaps with sandbox creation and upload.
+
+    Args:
+        sandbox: E2B sandbox with the dataset uploaded, or a task resolving to one
+        dataset_path: Path of the uploaded CSV inside the sandbox
+        instructions: Static agent instructions, sent as a cached system block
+        code_label: Short description of the generated code for progress output
+        defaults: Keys added to error and unparsed-output results
+        fallback_code: Hand-written analysis run instead of asking Claude again
+            when it returns no code or its code fails; $path is the dataset path
+        schema: Schema digest of the dataset; code that ran cleanly on a
+            dataset with the same schema is reused without asking Claude,
+            and evicted in favour of fresh code if it fails on this one
+
+    Returns:
+        Parsed JSON results (or raw output / error) plus Claude's interpretation
+    """
+    system = [{
+        "type": "text",
+        "text": instructions,
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+    # Only the dataset location is dynamic; instructions live in the system block
+    messages = [{"role": "user", "content": f"The dataset has been uploaded to {dataset_path}."}]
+
+    # Keyed on the instructions too, so editing a prompt invalidates its code
+    code_key = None
+    code = None
+    if schema is not None:
+        prompt_digest = hashlib.blake2b(instructions.encode(), digest_size=8).hexdigest()
+        code_key = cache_key(schema, f"code-{prompt_digest}")
+        code = load_cached(code_key)
+
+    cached = code is not None
+    if cached:
+        # Replay the cached call so the interpretation request is unchanged
+        tool_use_id = "toolu_cached"
+        messages.append({
+            "role": "assistant",
+            "content": [{
+                "type": "tool_use",
+                "id": tool_use_id,
+                "name": "execute_python",
+                "input": {"code": code}
+            }]
+        })
+        print(f"   ✓ Using cached {code_label} code")
+
+    # Runs at most twice: cached code that fails is dropped and Claude is
+    # asked once for fresh code before falling back
+    while True:
+        if code is None:
+            tool_use = await _request_code(system, messages)
+            if tool_use is None:
+                if fallback_code is None:
+                    return {}
+                print(f"   ⚠ Claude returned no {code_label} code, running fallback")
+                return await _run_fallback(sandbox, dataset_path, fallback_code, defaults)
+
+            tool_use_id = tool_use.id
+            code = tool_use.input["code"]
+            print(f"   ✓ Received {code_label} code from Claude")
+        print(f"\n{'='*60}\nCode to execute:\n{'='*60}\n{code}\n{'='*60}\n")
+
+        # Wait for the sandbox if it is still being created
+        if isinstance(sandbox, asyncio.Future):
+            sandbox = await sandbox
+
+        # Execute in E2B sandbox
+        execution = await run_code(sandbox, code)
+        if not (execution.error and cached):
+            break
+
+        # The schema matched, but the code doesn't fit this dataset; evict it
+        # so later datasets with the same schema don't keep re-running it
+        print(f"   ⚠ Cached {code_label} code failed: {execution.error}")
+        try_store(evict_cached, code_key)
+        del messages[1:]
+        code = None
+        cached = False
+
+    if execution.error:
+        print(f"   ✗ Execution error: {execution.error}")
+        if fallback_code is not None:
+            return await _run_fallback(sandbox, dataset_path, fallback_code, defaults)
+        return {
+            "error": str(execution.error),
+            "traceback": getattr(execution.error, 'traceback', None),
+            **defaults
+        }
+
+    print("   ✓ Code executed successfully")
+
+    # Parse the JSON printed between the result markers
+    results = extract_json(execution.logs.stdout)
+    if results is not None:
+        # Only the structured results go back to Claude, not the log tail
+        tool_output = json.dumps(results, default=str)[:MAX_TOOL_RESULT_CHARS]
+        if code_key is not None:
+            try_store(store_cached, code_key, code)
+    else:
+        stdout_text = "\n".join(execution.logs.stdout)
+        tool_output = stdout_text
+        results = {
+            "raw_output": stdout_text,
+            "results": [str(r) for r in execution.results],
+            **defaults
+        }
+
+    # Get Claude's interpretation
+    messages.append({
+        "role": "user",
+        "content": [{
+            "type": "tool_result",
+            "tool_use_id": tool_use_id,
+            "content": tool_output
+        }]
+    })
+
+    # Ask Claude to summarize
+    final_response = await create_message(
+        model=MODEL,
+        max_tokens=2000,
+        system=system,
+        messages=messages,
+        tools=_TOOLS
+    )
+
+    text = {block.type: block for block in final_response.content}.get("text")
+    if text is not None:
+        results["interpretation"] = text.text
+        print("   ✓ Claude's interpretation added")
+
+    return results
@@ -2,38 +2,19 @@
 Coordinator Agent
 Synthesizes findings from all agents into business insights
 """
-from anthropic import Anthropic
 import json
-import os
 
-async def synthesize_insights(stats_results: dict, viz_results: dict, anomaly_results: dict) -> str:
-    """
-    Synthesize findings from all agents into business recommendations
-    
-    Args:
-        stats_results: Results from statistical analysis
-        viz_results: Results from visualization
-        anomaly_results: Results from anomaly detection
-        
-    Returns:
-        String containing business insights report
-    """
-    print("🧠 Starting Insights Synthesis Agent...")
-    
-    try:
-        client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        
-        # Prepare synthesis prompt
-        prompt = f"""You are a business strategy consultant. You've received analysis from 3 specialist teams:
+from ._client import create_message
 
-**STATISTICAL ANALYSIS TEAM:**
-{json.dumps(stats_results, indent=2, default=str)}
+# Caps on how much of each agent's raw results is sent to the synthesis model
+_MAX_ITEMS = 10
+_MAX_TEXT = 2000
+_TOP_CORRELATIONS = 5
+_TOP_OUTLIERS = 10
 
-**VISUALIZATION TEAM:**
-Generated {viz_results.get('count', 0)} charts showing data patterns and relationships.
 
-**ANOMALY DETECTION TEAM:**
-{json.dumps(anomaly_results, indent=2, default=str)}
+# Static report instructions, sent as a cached system block
+_SYNTHESIS_INSTRUCTIONS = """You are a business strategy consultant. You will receive analysis from 3 specialist teams.
 
 Your task: Create a compelling executive report with:
 
@@ -60,11 +41,95 @@ Brief summary of data issues found and their potential impact
 
 Use clear, business-friendly language. Be specific with numbers where available. Focus on actionable insights."""
 
+_SYSTEM = [{
+    "type": "text",
+    "text": _SYNTHESIS_INSTRUCTIONS,
+    "cache_control": {"type": "ephemeral"}
+}]
+
+
+def _magnitude(item, fields: tuple) -> float:
+    """Absolute value of the first numeric field found in a result item"""
+    if isinstance(item, dict):
+        for field in fields:
+            value = item.get(field)
+            if isinstance(value, (int, float)):
+                return abs(value)
+    return 0.0
+
+
+def _top_by_magnitude(items: list, fields: tuple, k: int) -> list:
+    """Keep the k items with the largest |field| value"""
+    return sorted(items, key=lambda item: _magnitude(item, fields), reverse=True)[:k]
+
+
+def _trim(value, depth: int = 0):
+    """Cap nested collections and long strings so the prompt stays bounded"""
+    if isinstance(value, dict):
+        items = list(value.items())
+        if depth > 0:
+            items = items[:_MAX_ITEMS]
+        return {k: v if k == 'interpretation' else _trim(v, depth + 1) for k, v in items}
+    if isinstance(value, list):
+        return [_trim(v, depth + 1) for v in value[:_MAX_ITEMS]]
+    if isinstance(value, str):
+        return value[:_MAX_TEXT]
+    return value
+
+
+def _compact_stats(stats: dict) -> dict:
+    """Summarize statistical results: strongest correlations, capped column stats"""
+    compact = dict(stats)
+    for key, value in stats.items():
+        if 'correlation' in key.lower() and isinstance(value, list):
+            compact[key] = _top_by_magnitude(value, ('r', 'correlation', 'coefficient', 'value'),
+                                             _TOP_CORRELATIONS)
+    return _trim(compact)
+
+
+def _compact_anomalies(anomalies: dict) -> dict:
+    """Summarize anomaly results: issue totals and the most extreme outliers"""
+    compact = dict(anomalies)
+    outliers = anomalies.get('outliers')
+    if isinstance(outliers, list):
+        compact['outliers'] = _top_by_magnitude(outliers, ('z_score', 'zscore', 'z'), _TOP_OUTLIERS)
+        compact['outlier_count'] = len(outliers)
+    return _trim(compact)
+
+
+async def synthesize_insights(stats_results: dict, viz_results: dict, anomaly_results: dict) -> str:
+    """
+    Synthesize findings from all agents into business recommendations
+    
+    Args:
+        stats_results: Results from statistical analysis
+        viz_results: Results from visualization
+        anomaly_results: Results from anomaly detection
+        
+    Returns:
+        String containing business insights report
+    """
+    print("🧠 Starting Insights Synthesis Agent...")
+    
+    try:
+        # Prepare synthesis prompt
+        prompt = f"""Here is the analysis from the 3 specialist teams:
+
+**STATISTICAL ANALYSIS TEAM:**
+{json.dumps(_compact_stats(stats_results), indent=2, default=str)}
+
+**VISUALIZATION TEAM:**
+Generated {viz_results.get('count', 0)} charts showing data patterns and relationships.
+
+**ANOMALY DETECTION TEAM:**
+{json.dumps(_compact_anomalies(anomaly_results), indent=2, default=str)}"""
+
         print("   ✓ Sending synthesis request to Claude...")
         
-        response = client.messages.create(
+        response = await create_message(
             model="claude-sonnet-4-5-20250929",
             max_tokens=3000,
+            system=_SYSTEM,
             messages=[{"role": "user", "content": prompt}]
         )
         
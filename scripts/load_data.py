@@ -1,18 +1,22 @@
-import pandas as pd
+import fsspec
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
 
 # Path to the dataset on Hugging Face
 path = "hf://datasets/ctgadget/generated_sales_data/data/train-00000-of-00001.parquet"
 
-# Load only first 1000 rows
-df = pd.read_parquet(path, engine="pyarrow").head(1000)
+# Load only first 1000 rows, reading just the row groups that cover them
+# instead of downloading the whole file
+with fsspec.open(path, "rb") as f:
+    batch = next(pq.ParquetFile(f).iter_batches(batch_size=1000))
 
 # Ensure output directory exists
 output_dir = "test_data"
 os.makedirs(output_dir, exist_ok=True)
 
-# Save to CSV
+# Save to CSV straight from Arrow, quoting only where needed as pandas does
 output_path = os.path.join(output_dir, "sample_1000_rows.csv")
-df.to_csv(output_path, index=False)
+pacsv.write_csv(batch, output_path, pacsv.WriteOptions(quoting_style="needed"))
 
-print(f"Saved first 1000 rows to: {output_path}")
\ No newline at end of file
+print(f"Saved first 1000 rows to: {output_path}")